@@ -1,7 +1,83 @@
 from rest_framework.fields import SerializerMethodField
+from rest_framework.relations import (
+    HyperlinkedRelatedField,
+    HyperlinkedIdentityField,
+)
+
+
+ROLE_DATA = 'data'
+ROLE_LINK = 'link'
+ROLE_ID = 'id'
+ROLE_SKIP = 'skip'
+
+ROLES = (ROLE_DATA, ROLE_LINK, ROLE_ID, ROLE_SKIP)
 
 
 class LinkField(SerializerMethodField):
     def __init__(self, method_name, *args, **kwargs):
         self.method_name = method_name
         super(LinkField, self).__init__(method_name, *args, **kwargs)
+
+
+class FieldRoleRegistry(object):
+    """
+    Maps serializer field classes to the role they play in a
+    Collection+JSON item: data, link, id or skip.
+
+    Roles are resolved through the field class's MRO, so subclasses inherit
+    the role of their closest registered ancestor. Lookups are memoized per
+    field class; the memo is cleared whenever the registry changes.
+    """
+
+    def __init__(self, default=ROLE_DATA):
+        self.default = default
+        self._roles = {}
+        self._cache = {}
+
+    def register(self, field_class, role):
+        if role not in ROLES:
+            raise ValueError('Unknown field role: %r' % (role, ))
+        self._roles[field_class] = role
+        self._cache.clear()
+
+    def unregister(self, field_class):
+        self._roles.pop(field_class, None)
+        self._cache.clear()
+
+    def copy(self):
+        registry = self.__class__(default=self.default)
+        registry._roles.update(self._roles)
+        return registry
+
+    def get_role_for_class(self, field_class):
+        try:
+            return self._cache[field_class]
+        except KeyError:
+            pass
+
+        role = self.default
+        for klass in field_class.__mro__:
+            if klass in self._roles:
+                role = self._roles[klass]
+                break
+
+        self._cache[field_class] = role
+        return role
+
+    def get_role(self, field):
+        # Many-related fields wrap the actual relation; classify the child.
+        # Any field with a child_relation attribute is treated as a wrapper.
+        child = getattr(field, 'child_relation', None)
+        if child is not None:
+            field = child
+        return self.get_role_for_class(type(field))
+
+
+field_roles = FieldRoleRegistry()
+field_roles.register(HyperlinkedRelatedField, ROLE_LINK)
+field_roles.register(HyperlinkedIdentityField, ROLE_LINK)
+field_roles.register(LinkField, ROLE_LINK)
+
+
+def register_field_role(field_class, role):
+    field_roles.register(field_class, role)
@@ -1,37 +1,60 @@
-from rest_framework.relations import (
-    HyperlinkedRelatedField,
-    HyperlinkedIdentityField,
-)
+from django.core.exceptions import ImproperlyConfigured
+
 from rest_framework.serializers import HyperlinkedModelSerializer
 from rest_framework.renderers import JSONRenderer
 
-from .fields import LinkField
+from .fields import field_roles, ROLE_ID, ROLE_LINK, ROLE_SKIP
 
 
 class CollectionJsonRenderer(JSONRenderer):
     media_type = 'application/vnd.collection+json'
     format = 'collection+json'
+    field_roles = field_roles
 
     def _transform_field(self, key, value):
         return {'name': key, 'value': value}
 
-    def _get_related_fields(self, fields, id_field):
+    def _get_fields_with_role(self, fields, id_field, role):
+        get_role = self.field_roles.get_role
         return [k for (k, v) in fields
-                if k != id_field
-                and (isinstance(v, HyperlinkedRelatedField)
-                or isinstance(v, HyperlinkedIdentityField)
-                or isinstance(v, LinkField))]
+                if k != id_field and get_role(v) == role]
+
+    def _get_related_fields(self, fields, id_field):
+        return self._get_fields_with_role(fields, id_field, ROLE_LINK)
 
     def _simple_transform_item(self, item):
         data = [self._transform_field(k, v) for (k, v) in item.items()]
         return {'data': data}
 
     def _get_id_field(self, serializer):
+        id_fields = self._get_fields_with_role(serializer.fields.items(),
+                                               None, ROLE_ID)
+
         if isinstance(serializer, HyperlinkedModelSerializer):
+            if id_fields:
+                raise ImproperlyConfigured(
+                    'Hyperlinked serializer %s already uses %s as its id '
+                    'field: %s' % (serializer.__class__.__name__,
+                                   serializer.opts.url_field_name,
+                                   ', '.join(id_fields)))
             return serializer.opts.url_field_name
+        elif len(id_fields) > 1:
+            raise ImproperlyConfigured(
+                'Serializer %s has more than one id field: %s' % (
+                    serializer.__class__.__name__, ', '.join(id_fields)))
+        elif id_fields:
+            return id_fields[0]
         else:
             return None
 
+    def _get_field_layout(self, serializer):
+        fields = serializer.fields.items()
+        id_field = self._get_id_field(serializer)
+        related_fields = self._get_related_fields(fields, id_field)
+        skipped_fields = self._get_fields_with_role(fields, id_field,
+                                                    ROLE_SKIP)
+        return id_field, related_fields, skipped_fields
+
     def _get_item_field_links(self, field_name, item):
         data = item[field_name]
 
@@ -42,14 +65,16 @@ class CollectionJsonRenderer(JSONRenderer):
         else:
             return [self._make_link(field_name, data)]
 
-    def _transform_item(self, serializer, item):
-        fields = serializer.fields.items()
-        id_field = self._get_id_field(serializer)
-        related_fields = self._get_related_fields(fields, id_field)
+    def _transform_item(self, serializer, item, layout=None):
+        if layout is None:
+            layout = self._get_field_layout(serializer)
+        id_field, related_fields, skipped_fields = layout
 
         data = [self._transform_field(k, item[k])
                 for k in item.keys()
-                if k != id_field and k not in related_fields]
+                if k != id_field
+                and k not in related_fields
+                and k not in skipped_fields]
         result = {'data': data}
 
         if id_field:
@@ -70,7 +95,9 @@ class CollectionJsonRenderer(JSONRenderer):
 
         if hasattr(view, 'get_serializer'):
             serializer = view.get_serializer()
-            return map(lambda x: self._transform_item(serializer, x), data)
+            layout = self._get_field_layout(serializer)
+            return map(lambda x: self._transform_item(serializer, x, layout),
+                       data)
         else:
             return map(self._simple_transform_item, data)
 
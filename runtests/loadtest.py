@@ -0,0 +1,315 @@
+#!/usr/bin/env python
+"""
+Load-test harness for the Collection+JSON renderer.
+
+Seeds the testapp models into a scratch sqlite database, serves them from a
+threaded local WSGI server and drives the root, list, detail and paginated
+endpoints from concurrent clients. Reports latency percentiles, requests per
+second and queries per request for each endpoint.
+
+    $ python -m runtests.loadtest --rows 1000 --clients 8 --requests 400
+    $ python -m runtests.loadtest --profile renderer.prof
+
+The --profile dump is a standard pstats file, so it can be fed to snakeviz,
+gprof2dot or flameprof to get a flamegraph. The exit status is 1 if any
+request failed and 0 otherwise.
+
+Requires Python >= 2.7 and Django >= 1.4.
+"""
+
+import argparse
+import cProfile
+import math
+import os
+import pstats
+import sys
+import tempfile
+import threading
+from timeit import default_timer
+from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+from six.moves.socketserver import ThreadingMixIn
+from six.moves.urllib.request import urlopen
+
+os.environ['DJANGO_SETTINGS_MODULE'] = 'testapp.tests.settings'
+
+IDIOTS_PER_DUMMY = 2
+DUMMIES_PER_MORON = 10
+
+
+class ThreadedWSGIServer(ThreadingMixIn, WSGIServer):
+    daemon_threads = True
+
+
+class QuietWSGIRequestHandler(WSGIRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+class InstrumentedApplication(object):
+    """
+    Wraps a WSGI application to count queries per successful request and
+    optionally profile each request.
+    """
+
+    def __init__(self, application, profile=False):
+        self.application = application
+        self.profile = profile
+        self.lock = threading.Lock()
+        self.query_counts = []
+        self.profiles = []
+
+    def reset(self):
+        with self.lock:
+            self.query_counts = []
+
+    def __call__(self, environ, start_response):
+        from django.db import connection, reset_queries
+
+        statuses = []
+
+        def capture_start_response(status, headers, exc_info=None):
+            statuses.append(status)
+            return start_response(status, headers, exc_info)
+
+        reset_queries()
+        if self.profile:
+            profile = cProfile.Profile()
+            response = profile.runcall(self.application, environ,
+                                       capture_start_response)
+        else:
+            profile = None
+            response = self.application(environ, capture_start_response)
+        query_count = len(connection.queries)
+        succeeded = statuses and statuses[-1].startswith('2')
+
+        with self.lock:
+            if succeeded:
+                self.query_counts.append(query_count)
+            if profile is not None:
+                self.profiles.append(profile)
+
+        return response
+
+
+def setup_django(database_name):
+    from django.conf import settings
+    settings.DATABASES['default']['NAME'] = database_name
+    settings.ROOT_URLCONF = 'runtests.loadtest_urls'
+    settings.DEBUG = True
+
+    import django
+    if django.VERSION[0] >= 1 and django.VERSION[1] >= 7:
+        django.setup()
+
+    from django.core.management import call_command
+    if django.VERSION[0] >= 1 and django.VERSION[1] >= 7:
+        call_command('migrate', interactive=False, verbosity=0)
+    else:
+        call_command('syncdb', interactive=False, verbosity=0)
+
+
+def seed(rows):
+    from testapp.models import Dummy, Idiot, Moron
+
+    moron_count = rows // DUMMIES_PER_MORON + 1
+    Moron.objects.bulk_create(
+        [Moron(name='moron %d' % i) for i in range(moron_count)])
+    Idiot.objects.bulk_create(
+        [Idiot(name='idiot %d' % i) for i in range(IDIOTS_PER_DUMMY * 5)])
+
+    moron_ids = list(Moron.objects.values_list('id', flat=True))
+    idiot_ids = list(Idiot.objects.values_list('id', flat=True))
+
+    Dummy.objects.bulk_create(
+        [Dummy(name='dummy %d' % i,
+               moron_id=moron_ids[i // DUMMIES_PER_MORON])
+         for i in range(rows)])
+
+    Through = Dummy.idiots.through
+    links = []
+    for (n, dummy_id) in enumerate(Dummy.objects.values_list('id',
+                                                             flat=True)):
+        for i in range(IDIOTS_PER_DUMMY):
+            idiot_id = idiot_ids[(n + i) % len(idiot_ids)]
+            links.append(Through(dummy_id=dummy_id, idiot_id=idiot_id))
+    Through.objects.bulk_create(links)
+
+    return list(Dummy.objects.values_list('id', flat=True))
+
+
+def get_endpoints(dummy_ids, rows):
+    from runtests.loadtest_urls import PaginatedDummyReadOnlyModelViewSet
+
+    page_size = PaginatedDummyReadOnlyModelViewSet.paginate_by
+    page_count = max(int(math.ceil(rows / float(page_size))), 1)
+    return [
+        ('root', lambda n: '/rest-api/'),
+        ('list', lambda n: '/rest-api/dummy/'),
+        ('detail',
+         lambda n: '/rest-api/dummy/%d/' % dummy_ids[n % len(dummy_ids)]),
+        ('paginated',
+         lambda n: '/rest-api/paginated-dummy/?page=%d' % (n % page_count + 1)),
+    ]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = int(math.ceil(pct / 100.0 * len(ordered))) - 1
+    return ordered[max(index, 0)]
+
+
+def drive(base_url, get_path, requests, clients):
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        while True:
+            with lock:
+                n = next(counter, None)
+            if n is None:
+                return
+
+            url = base_url + get_path(n)
+            start = default_timer()
+            try:
+                urlopen(url).read()
+            except Exception as e:
+                with lock:
+                    errors.append(e)
+                continue
+            elapsed = default_timer() - start
+
+            with lock:
+                latencies.append(elapsed)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    start = default_timer()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    duration = default_timer() - start
+
+    return latencies, errors, duration
+
+
+def report(name, latencies, errors, duration, query_counts):
+    if not latencies:
+        print('%-10s no successful requests (%d errors)' % (name, len(errors)))
+        return len(errors)
+
+    queries = float(sum(query_counts)) / max(len(query_counts), 1)
+    print('%-10s %8.2f %8.2f %8.2f %10.1f %10.1f %8d' % (
+        name,
+        percentile(latencies, 50) * 1000,
+        percentile(latencies, 95) * 1000,
+        percentile(latencies, 99) * 1000,
+        len(latencies) / duration,
+        queries,
+        len(errors),
+    ))
+
+    return len(errors)
+
+
+def dump_profile(profiles, path):
+    if not profiles:
+        return
+
+    stats = pstats.Stats(profiles[0], stream=sys.stdout)
+    for profile in profiles[1:]:
+        stats.add(profile)
+    stats.dump_stats(path)
+
+    print('')
+    print('Profile written to %s' % path)
+    stats.sort_stats('cumulative').print_stats('rest_framework_cj')
+
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(
+        description='Load test the Collection+JSON renderer.')
+    parser.add_argument('--rows', type=int, default=1000,
+                        help='number of Dummy rows to seed')
+    parser.add_argument('--clients', type=int, default=8,
+                        help='number of concurrent clients')
+    parser.add_argument('--requests', type=int, default=200,
+                        help='requests per endpoint')
+    parser.add_argument('--endpoint', action='append', dest='endpoints',
+                        choices=('root', 'list', 'detail', 'paginated'),
+                        help='endpoint to drive (default: all)')
+    parser.add_argument('--profile', metavar='PATH',
+                        help='dump cProfile stats for all requests to PATH')
+    args = parser.parse_args(argv)
+
+    if args.rows < 1:
+        parser.error('--rows must be at least 1')
+    if args.clients < 1:
+        parser.error('--clients must be at least 1')
+    if args.requests < 1:
+        parser.error('--requests must be at least 1')
+
+    return args
+
+
+def main(argv=None):
+    args = parse_args(argv)
+
+    handle, database_name = tempfile.mkstemp(suffix='.db')
+    os.close(handle)
+    failures = 0
+    server = None
+    server_thread = None
+
+    try:
+        setup_django(database_name)
+        dummy_ids = seed(args.rows)
+
+        from django.core.wsgi import get_wsgi_application
+        application = InstrumentedApplication(get_wsgi_application(),
+                                              profile=bool(args.profile))
+        server = make_server('127.0.0.1', 0, application,
+                             server_class=ThreadedWSGIServer,
+                             handler_class=QuietWSGIRequestHandler)
+        server_thread = threading.Thread(target=server.serve_forever)
+        server_thread.daemon = True
+        server_thread.start()
+        base_url = 'http://127.0.0.1:%d' % server.server_port
+
+        print('%d rows, %d clients, %d requests per endpoint' % (
+            args.rows, args.clients, args.requests))
+        print('%-10s %8s %8s %8s %10s %10s %8s' % (
+            'endpoint', 'p50 ms', 'p95 ms', 'p99 ms', 'req/s', 'queries',
+            'errors'))
+
+        for (name, get_path) in get_endpoints(dummy_ids, args.rows):
+            if args.endpoints and name not in args.endpoints:
+                continue
+
+            application.reset()
+            latencies, errors, duration = drive(base_url, get_path,
+                                                args.requests, args.clients)
+            failures += report(name, latencies, errors, duration,
+                               application.query_counts)
+
+        if failures:
+            print('')
+            print('%d failed requests' % failures)
+
+        if args.profile:
+            dump_profile(application.profiles, args.profile)
+    finally:
+        if server_thread is not None:
+            server.shutdown()
+        if server is not None:
+            server.server_close()
+        os.remove(database_name)
+
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
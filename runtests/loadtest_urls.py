@@ -0,0 +1,25 @@
+from django.conf.urls import patterns, include
+
+from rest_framework.routers import DefaultRouter
+
+from testapp.views import (
+    DummyReadOnlyModelViewSet,
+    IdiotReadOnlyModelViewSet,
+    MoronReadOnlyModelViewSet,
+)
+
+
+class PaginatedDummyReadOnlyModelViewSet(DummyReadOnlyModelViewSet):
+    paginate_by = 20
+
+
+router = DefaultRouter()
+router.register('dummy', DummyReadOnlyModelViewSet)
+router.register('moron', MoronReadOnlyModelViewSet)
+router.register('idiot', IdiotReadOnlyModelViewSet)
+router.register('paginated-dummy', PaginatedDummyReadOnlyModelViewSet,
+                base_name='paginated-dummy')
+urlpatterns = patterns(
+    '',
+    (r'^rest-api/', include(router.urls)),
+)
@@ -0,0 +1,92 @@
+from django.test import TestCase
+from django.utils import unittest
+
+import rest_framework
+from rest_framework.fields import CharField, SerializerMethodField
+from rest_framework.relations import HyperlinkedRelatedField
+
+from rest_framework_cj.fields import (
+    FieldRoleRegistry, LinkField, field_roles,
+    ROLE_DATA, ROLE_LINK, ROLE_SKIP,
+)
+
+
+class CustomLinkField(SerializerMethodField):
+    pass
+
+
+class SubclassedLinkField(LinkField):
+    pass
+
+
+DRF_3 = int(rest_framework.VERSION.split('.')[0]) >= 3
+
+
+class TestDefaultFieldRoles(TestCase):
+    def test_plain_fields_are_data(self):
+        self.assertEqual(field_roles.get_role_for_class(CharField), ROLE_DATA)
+
+    def test_hyperlinked_fields_are_links(self):
+        role = field_roles.get_role_for_class(HyperlinkedRelatedField)
+        self.assertEqual(role, ROLE_LINK)
+
+    def test_link_field_subclasses_are_links(self):
+        role = field_roles.get_role_for_class(SubclassedLinkField)
+        self.assertEqual(role, ROLE_LINK)
+
+    @unittest.skipIf(not DRF_3, 'ManyRelatedField wraps a child in DRF 3')
+    def test_many_related_fields_use_the_child_role(self):
+        from rest_framework.relations import ManyRelatedField
+
+        field = HyperlinkedRelatedField(many=True, read_only=True,
+                                        view_name='idiot-detail')
+        self.assertIsInstance(field, ManyRelatedField)
+        self.assertEqual(field_roles.get_role(field), ROLE_LINK)
+
+
+class TestFieldRoleRegistry(TestCase):
+    def setUp(self):
+        self.registry = FieldRoleRegistry()
+
+    def test_unregistered_fields_use_the_default_role(self):
+        role = self.registry.get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_DATA)
+
+    def test_registered_fields_use_their_role(self):
+        self.registry.register(CustomLinkField, ROLE_LINK)
+        role = self.registry.get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_LINK)
+
+    def test_the_closest_registered_ancestor_wins(self):
+        self.registry.register(SerializerMethodField, ROLE_SKIP)
+        self.registry.register(LinkField, ROLE_LINK)
+        role = self.registry.get_role_for_class(SubclassedLinkField)
+        self.assertEqual(role, ROLE_LINK)
+
+    def test_registering_invalidates_memoized_roles(self):
+        self.registry.get_role_for_class(CustomLinkField)
+        self.registry.register(CustomLinkField, ROLE_SKIP)
+        role = self.registry.get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_SKIP)
+
+    def test_unregistering_restores_the_default_role(self):
+        self.registry.register(CustomLinkField, ROLE_LINK)
+        self.registry.get_role_for_class(CustomLinkField)
+        self.registry.unregister(CustomLinkField)
+        role = self.registry.get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_DATA)
+
+    def test_copies_keep_the_registered_roles(self):
+        self.registry.register(CustomLinkField, ROLE_LINK)
+        role = self.registry.copy().get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_LINK)
+
+    def test_copies_are_independent(self):
+        registry = self.registry.copy()
+        registry.register(CustomLinkField, ROLE_SKIP)
+        role = self.registry.get_role_for_class(CustomLinkField)
+        self.assertEqual(role, ROLE_DATA)
+
+    def test_unknown_roles_are_rejected(self):
+        self.assertRaises(ValueError, self.registry.register,
+                          CustomLinkField, 'bogus')
@@ -0,0 +1,54 @@
+import os
+import pstats
+import shutil
+import subprocess
+import sys
+import tempfile
+
+import django
+from django.utils import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(
+    os.path.abspath(__file__))))
+
+UNSUPPORTED = sys.version_info < (2, 7) or django.VERSION < (1, 4)
+
+
+@unittest.skipIf(UNSUPPORTED, 'the load test needs Python 2.7+/Django 1.4+')
+class TestLoadTest(unittest.TestCase):
+    """
+    Runs the harness in a subprocess, since it configures its own database
+    and urlconf and can't share the test runner's.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def run_loadtest(self, *args):
+        command = [sys.executable, '-m', 'runtests.loadtest',
+                   '--rows', '5', '--clients', '2', '--requests', '4']
+        process = subprocess.Popen(command + list(args), cwd=ROOT,
+                                   stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT)
+        output = process.communicate()[0].decode('utf8')
+        return process.returncode, output
+
+    def test_it_reports_every_endpoint_without_errors(self):
+        returncode, output = self.run_loadtest()
+        self.assertEqual(returncode, 0, output)
+
+        rows = [line.split()[0] for line in output.splitlines()
+                if line.strip()]
+        for name in ('root', 'list', 'detail', 'paginated'):
+            self.assertIn(name, rows, output)
+
+    def test_it_dumps_loadable_profile_stats(self):
+        path = os.path.join(self.directory, 'renderer.prof')
+        returncode, output = self.run_loadtest('--profile', path)
+        self.assertEqual(returncode, 0, output)
+
+        stats = pstats.Stats(path)
+        self.assertTrue(stats.total_calls > 0)
@@ -6,12 +6,13 @@ if django.VERSION[0] == 1 and django.VERSION[1] == 3:
 else:
     from django.conf.urls import patterns, include
 
+from django.core.exceptions import ImproperlyConfigured
 from django.test import TestCase
 
 from collection_json import Collection
 from rest_framework import status
 from rest_framework.exceptions import ParseError
-from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.fields import SerializerMethodField
 from rest_framework.response import Response
 from rest_framework.routers import DefaultRouter
 from rest_framework.serializers import (
@@ -22,55 +23,16 @@ from rest_framework.views import APIView
 from rest_framework.viewsets import ReadOnlyModelViewSet
 
 from rest_framework_cj.renderers import CollectionJsonRenderer
-from rest_framework_cj.fields import LinkField
+from rest_framework_cj.fields import (
+    field_roles, ROLE_ID, ROLE_LINK, ROLE_SKIP
+)
 
 from testapp.models import Dummy, Idiot, Moron, Simple
-
-
-class MoronHyperlinkedModelSerializer(HyperlinkedModelSerializer):
-    class Meta(object):
-        model = Moron
-        fields = ('url', 'name')
-
-
-class MoronReadOnlyModelViewSet(ReadOnlyModelViewSet):
-    renderer_classes = (CollectionJsonRenderer, )
-    queryset = Moron.objects.all()
-    serializer_class = MoronHyperlinkedModelSerializer
-
-
-class IdiotHyperlinkedModelSerializer(HyperlinkedModelSerializer):
-    class Meta(object):
-        model = Idiot
-        fields = ('url', 'name')
-
-
-class IdiotReadOnlyModelViewSet(ReadOnlyModelViewSet):
-    renderer_classes = (CollectionJsonRenderer, )
-    queryset = Idiot.objects.all()
-    serializer_class = IdiotHyperlinkedModelSerializer
-
-
-class DummyHyperlinkedModelSerializer(HyperlinkedModelSerializer):
-    other_stuff = LinkField('get_other_link')
-    empty_link = LinkField('get_empty_link')
-    some_link = HyperlinkedIdentityField(view_name='moron-detail')
-
-    class Meta(object):
-        model = Dummy
-        fields = ('url', 'name', 'moron', 'idiots', 'other_stuff', 'some_link', 'empty_link')
-
-    def get_other_link(self, obj):
-        return 'http://other-stuff.com/'
-
-    def get_empty_link(self, obj):
-        return None
-
-
-class DummyReadOnlyModelViewSet(ReadOnlyModelViewSet):
-    renderer_classes = (CollectionJsonRenderer, )
-    queryset = Dummy.objects.all()
-    serializer_class = DummyHyperlinkedModelSerializer
+from testapp.views import (
+    DummyReadOnlyModelViewSet,
+    IdiotReadOnlyModelViewSet,
+    MoronReadOnlyModelViewSet,
+)
 
 
 class NoSerializerView(APIView):
@@ -253,6 +215,154 @@ class TestErrorHandling(SimpleGetTest):
         self.assertEqual(self.collection.error.message, 'lol nice one')
 
 
+class ThirdPartyLinkField(SerializerMethodField):
+    pass
+
+
+class HiddenField(SerializerMethodField):
+    pass
+
+
+class IdentifierField(SerializerMethodField):
+    pass
+
+
+class RegisteredFieldsRenderer(CollectionJsonRenderer):
+    field_roles = field_roles.copy()
+    field_roles.register(ThirdPartyLinkField, ROLE_LINK)
+    field_roles.register(HiddenField, ROLE_SKIP)
+    field_roles.register(IdentifierField, ROLE_ID)
+
+
+class RegisteredFieldsSerializer(HyperlinkedModelSerializer):
+    third_party = ThirdPartyLinkField('get_third_party')
+    hidden = HiddenField('get_hidden')
+
+    class Meta(object):
+        model = Moron
+        fields = ('url', 'name', 'third_party', 'hidden')
+
+    def get_third_party(self, obj):
+        return 'http://third-party.com/'
+
+    def get_hidden(self, obj):
+        return 'secret'
+
+
+class RegisteredFieldsViewSet(ReadOnlyModelViewSet):
+    renderer_classes = (RegisteredFieldsRenderer, )
+    queryset = Moron.objects.all()
+    serializer_class = RegisteredFieldsSerializer
+
+
+class TestRegisteredFieldRoles(SimpleGetTest):
+    endpoint = '/rest-api/registered-fields/'
+
+    def setUp(self):
+        Moron.objects.create(name='Bob LawLaw')
+        super(TestRegisteredFieldRoles, self).setUp()
+
+    def test_registered_link_fields_are_rendered_as_links(self):
+        href = self.collection.items[0].links.find(rel='third_party')[0].href
+        self.assertEqual(href, 'http://third-party.com/')
+
+    def test_registered_link_fields_are_not_rendered_as_data(self):
+        data = self.collection.items[0].data.find('third_party')
+        self.assertEqual(len(data), 0)
+
+    def test_skipped_fields_are_not_rendered(self):
+        item = self.collection.items[0]
+        self.assertEqual(len(item.data.find('hidden')), 0)
+        self.assertEqual(len(item.links.find(rel='hidden')), 0)
+
+    def test_the_default_registry_is_unchanged(self):
+        role = CollectionJsonRenderer.field_roles.get_role_for_class(
+            ThirdPartyLinkField)
+        self.assertNotEqual(role, ROLE_LINK)
+
+
+class IdentifiedModelSerializer(ModelSerializer):
+    identifier = IdentifierField('get_identifier')
+
+    class Meta(object):
+        model = Simple
+        fields = ('name', 'identifier')
+
+    def get_identifier(self, obj):
+        return 'http://identified.com/%d/' % obj.pk
+
+
+class IdentifiedViewSet(ReadOnlyModelViewSet):
+    renderer_classes = (RegisteredFieldsRenderer, )
+    queryset = Simple.objects.all()
+    serializer_class = IdentifiedModelSerializer
+
+
+class TestIdFieldRole(SimpleGetTest):
+    endpoint = '/rest-api/identified/'
+
+    def setUp(self):
+        self.simple = Simple.objects.create(name='Foobar Baz')
+        super(TestIdFieldRole, self).setUp()
+
+    def test_the_id_field_is_used_as_the_item_href(self):
+        href = self.collection.items[0].href
+        self.assertEqual(href, 'http://identified.com/%d/' % self.simple.pk)
+
+    def test_the_id_field_is_not_rendered_as_data(self):
+        data = self.collection.items[0].data.find('identifier')
+        self.assertEqual(len(data), 0)
+
+    def test_other_fields_are_rendered_as_data(self):
+        name = self.collection.items[0].data.find('name')[0].value
+        self.assertEqual(name, 'Foobar Baz')
+
+
+class DoublyIdentifiedModelSerializer(IdentifiedModelSerializer):
+    other_identifier = IdentifierField('get_identifier')
+
+    class Meta(object):
+        model = Simple
+        fields = ('name', 'identifier', 'other_identifier')
+
+
+class DoublyIdentifiedViewSet(IdentifiedViewSet):
+    serializer_class = DoublyIdentifiedModelSerializer
+
+
+class TestMultipleIdFields(TestCase):
+    urls = 'testapp.tests.test_renderers'
+
+    def test_multiple_id_fields_are_rejected(self):
+        Simple.objects.create(name='Foobar Baz')
+        self.assertRaises(ImproperlyConfigured, self.client.get,
+                          '/rest-api/doubly-identified/')
+
+
+class HyperlinkedIdentifiedSerializer(HyperlinkedModelSerializer):
+    identifier = IdentifierField('get_identifier')
+
+    class Meta(object):
+        model = Moron
+        fields = ('url', 'name', 'identifier')
+
+    def get_identifier(self, obj):
+        return 'http://identified.com/%d/' % obj.pk
+
+
+class HyperlinkedIdentifiedViewSet(RegisteredFieldsViewSet):
+    serializer_class = HyperlinkedIdentifiedSerializer
+
+
+class TestHyperlinkedIdFields(TestCase):
+    urls = 'testapp.tests.test_renderers'
+
+    def test_id_fields_on_hyperlinked_serializers_are_rejected(self):
+        Moron.objects.create(name='Bob LawLaw')
+        self.assertRaises(ImproperlyConfigured, self.client.get,
+                          '/rest-api/hyperlinked-identified/')
+
+
 class UrlRewriteRenderer(CollectionJsonRenderer):
     def get_href(self, request):
         return urljoin('http://rewritten.com', request.path)
@@ -294,6 +404,13 @@ router.register('dummy', DummyReadOnlyModelViewSet)
 router.register('moron', MoronReadOnlyModelViewSet)
 router.register('idiot', IdiotReadOnlyModelViewSet)
 router.register('normal-model', SimpleViewSet)
+router.register('registered-fields', RegisteredFieldsViewSet,
+                base_name='registered-fields')
+router.register('identified', IdentifiedViewSet, base_name='identified')
+router.register('hyperlinked-identified', HyperlinkedIdentifiedViewSet,
+                base_name='hyperlinked-identified')
+router.register('doubly-identified', DoublyIdentifiedViewSet,
+                base_name='doubly-identified')
 urlpatterns = patterns(
     '',
     (r'^rest-api/', include(router.urls)),
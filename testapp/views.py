@@ -0,0 +1,54 @@
+from rest_framework.relations import HyperlinkedIdentityField
+from rest_framework.serializers import HyperlinkedModelSerializer
+from rest_framework.viewsets import ReadOnlyModelViewSet
+
+from rest_framework_cj.renderers import CollectionJsonRenderer
+from rest_framework_cj.fields import LinkField
+
+from testapp.models import Dummy, Idiot, Moron
+
+
+class MoronHyperlinkedModelSerializer(HyperlinkedModelSerializer):
+    class Meta(object):
+        model = Moron
+        fields = ('url', 'name')
+
+
+class MoronReadOnlyModelViewSet(ReadOnlyModelViewSet):
+    renderer_classes = (CollectionJsonRenderer, )
+    queryset = Moron.objects.all()
+    serializer_class = MoronHyperlinkedModelSerializer
+
+
+class IdiotHyperlinkedModelSerializer(HyperlinkedModelSerializer):
+    class Meta(object):
+        model = Idiot
+        fields = ('url', 'name')
+
+
+class IdiotReadOnlyModelViewSet(ReadOnlyModelViewSet):
+    renderer_classes = (CollectionJsonRenderer, )
+    queryset = Idiot.objects.all()
+    serializer_class = IdiotHyperlinkedModelSerializer
+
+
+class DummyHyperlinkedModelSerializer(HyperlinkedModelSerializer):
+    other_stuff = LinkField('get_other_link')
+    empty_link = LinkField('get_empty_link')
+    some_link = HyperlinkedIdentityField(view_name='moron-detail')
+
+    class Meta(object):
+        model = Dummy
+        fields = ('url', 'name', 'moron', 'idiots', 'other_stuff', 'some_link', 'empty_link')
+
+    def get_other_link(self, obj):
+        return 'http://other-stuff.com/'
+
+    def get_empty_link(self, obj):
+        return None
+
+
+class DummyReadOnlyModelViewSet(ReadOnlyModelViewSet):
+    renderer_classes = (CollectionJsonRenderer, )
+    queryset = Dummy.objects.all()
+    serializer_class = DummyHyperlinkedModelSerializer